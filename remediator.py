@@ -1,11 +1,17 @@
-import boto3
-import requests
+import asyncio
+import atexit
+import functools
+import hashlib
+import itertools
 import time
 import logging
-import json
+import orjson
 import os
-from datetime import datetime
-from openai import OpenAI, RateLimitError
+import queue
+import random
+import re
+import threading
+from collections import OrderedDict, deque
 
 # Use environment variables for Lambda compatibility
 CLOUD_REGION = os.getenv('CLOUD_REGION', 'us-east-1')
@@ -14,9 +20,30 @@ CLOUD_SECRET_KEY = os.getenv('CLOUD_SECRET_KEY')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SLACK_WEBHOOK_URL = os.getenv('SLACK_WEBHOOK_URL')
 
+# Optional Slack app credentials: with both set, a live progress message is posted
+# via chat.postMessage and edited with chat.update while the analyses run
+SLACK_BOT_TOKEN = os.getenv('SLACK_BOT_TOKEN')
+SLACK_CHANNEL = os.getenv('SLACK_CHANNEL')
+
+# Only analyze log groups whose name starts with this prefix (filtered server-side)
+LOG_GROUP_PREFIX = os.getenv('LOG_GROUP_PREFIX')
+
+# Optional DynamoDB table (TTL attribute: expires_at) or S3 bucket for caching analyses across invocations
+ANALYSIS_CACHE_TABLE = os.getenv('ANALYSIS_CACHE_TABLE')
+ANALYSIS_CACHE_BUCKET = os.getenv('ANALYSIS_CACHE_BUCKET')
+ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', str(7 * 24 * 3600)))
+ANALYSIS_CACHE_REMOTE = bool(ANALYSIS_CACHE_TABLE or ANALYSIS_CACHE_BUCKET)
+
+# DynamoDB table (same key schema as the cache) tracking submitted OpenAI Batch API jobs
+BATCH_STATE_TABLE = os.getenv('BATCH_STATE_TABLE') or ANALYSIS_CACHE_TABLE
+
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# LOG_LEVEL=WARNING in production skips the cost of formatting info/debug messages
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# The Lambda runtime configures the root logger itself, so set our level explicitly
+logger.setLevel(LOG_LEVEL)
 
 # Fallback to config.py for local development
 if not CLOUD_ACCESS_KEY:
@@ -38,103 +65,696 @@ if not CLOUD_ACCESS_KEY:
         logger.error("No config.py found and environment variables not set")
         raise RuntimeError("Configuration not found")
 
-# Configure the OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# botocore, openai and httpx are heavy imports, so they are only loaded when a run
+# first needs them; the clients are then cached so warm Lambda invocations reuse them
+_aws_session = None
+_aws_config = None
+_aws_clients = {}
+# Clients can be requested from worker threads (see _resolve_all_locally)
+_aws_client_lock = threading.Lock()
+_openai_client = None
+_slack_http = None
 
-def put_custom_metric(metric_name, value, unit='Count', dimensions=None):
-    """Send custom metrics to CloudWatch for monitoring"""
-    try:
-        # Use same credential pattern as fetch_log_groups()
-        if CLOUD_ACCESS_KEY and CLOUD_SECRET_KEY:
-            cloudwatch = boto3.client(
-                'cloudwatch', 
-                region_name=CLOUD_REGION,
-                aws_access_key_id=CLOUD_ACCESS_KEY,
-                aws_secret_access_key=CLOUD_SECRET_KEY
+# METRICS_ENABLED=false turns custom metrics off entirely (no buffering, no API calls)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+
+# Metrics are queued during a run and sent by a background thread in batches;
+# PutMetricData accepts up to 1000 entries per call
+METRICS_NAMESPACE = 'LogRemediation'
+METRICS_PER_REQUEST = 1000
+METRICS_SEND_INTERVAL = 5.0
+# Inside Lambda, metrics are written to stdout in Embedded Metric Format (EMF) and
+# extracted by CloudWatch Logs asynchronously, so no API calls are needed at all
+RUNNING_IN_LAMBDA = bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+METRICS_USE_EMF = RUNNING_IN_LAMBDA
+EMF_METRICS_PER_DOCUMENT = 100
+_metric_queue: queue.Queue = queue.Queue()
+_metric_worker_thread = None
+_metric_worker_lock = threading.Lock()
+# Queued by flush_metrics() so the worker sends its partial batch straight away
+_METRIC_FLUSH = object()
+
+# Any chat model works, including local ones behind an OpenAI-compatible API
+# (e.g. ollama: OPENAI_BASE_URL=http://localhost:11434/v1, which the SDK reads itself)
+OPENAI_MODEL = os.getenv('REMEDIATOR_MODEL', 'gpt-4o-mini')
+
+# The instructions never change, so they live in one shared system message and
+# only the log group names are sent per request (this also keeps the prefix cacheable)
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Analyze the AWS CloudWatch log groups listed by the user, one name per line. "
+        "For each log group cover: "
+        "(1) what type of AWS service it likely belongs to, "
+        "(2) what kind of logs it probably contains, "
+        "(3) any potential issues or patterns to monitor, "
+        "(4) a recommended retention period. "
+        "Keep each analysis concise (2-3 sentences). "
+        "Respond with a JSON object mapping every log group name, exactly as given, to its analysis string."
+    )
+}
+
+# Bump whenever the prompt changes so cached analyses are not reused
+PROMPT_VERSION = "3"
+
+# Several log groups are analyzed per OpenAI request; the completion budget scales with the
+# batch. 80 tokens covers a 2-3 sentence analysis, plus room for echoing each name as a JSON key
+ANALYSIS_BATCH_SIZE = 10
+ANALYSIS_TOKENS_PER_GROUP = 80
+
+# In-process LRU of analyses, kept warm between Lambda invocations
+ANALYSIS_CACHE_MAXSIZE = 1024
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# OpenAI concurrency starts here and is tuned at runtime by the Backpressure controller
+# (cap it to match the OpenAI account's rate-limit tier with OPENAI_MAX_CONCURRENCY)
+ANALYSIS_CONCURRENCY = 4
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '16'))
+
+# Upper bound for any single retry backoff, in seconds
+MAX_BACKOFF = 30.0
+
+# Long-lived event loop: the async OpenAI client keeps pooled connections bound
+# to the loop that opened them, so warm Lambda invocations must reuse it
+_event_loop = None
+
+# Slack messages are buffered during a run and sent in as few posts as possible,
+# one Block Kit section per message (Slack caps sections and blocks per message)
+SLACK_MAX_MESSAGE_CHARS = 40000
+SLACK_MAX_SECTION_CHARS = 3000
+SLACK_MAX_BLOCKS = 50
+SLACK_MESSAGE_SEPARATOR = "\n\n"
+# Minimum gap between chat.update calls on the progress message, in seconds
+SLACK_PROGRESS_INTERVAL = 0.5
+_slack_buffer: list[str] = []
+
+def aws_client(service):
+    """Return the shared AWS client for a service, creating it on first use"""
+    global _aws_session, _aws_config
+    if service in _aws_clients:
+        return _aws_clients[service]
+
+    with _aws_client_lock:
+        if _aws_session is None:
+            # A bare botocore session skips importing boto3 (and its resource models),
+            # and its create_client gives the same low-level clients boto3.client does
+            import botocore.session
+            from botocore.config import Config
+
+            # Adaptive retries add client-side rate limiting on throttling errors, and
+            # TCP keepalive stops idle pooled connections being dropped between calls
+            _aws_config = Config(
+                retries={'mode': 'adaptive', 'max_attempts': 5},
+                tcp_keepalive=True,
+                connect_timeout=2,
+                read_timeout=10,
+                max_pool_connections=20
             )
-        else:
-            # Use IAM role (for Lambda execution)
-            cloudwatch = boto3.client('cloudwatch', region_name=CLOUD_REGION)
-            
-        metric_data = {
-            'MetricName': metric_name,
-            'Value': value,
-            'Unit': unit,
-            'Timestamp': datetime.utcnow()
-        }
+
+            # Use provided credentials locally, otherwise the IAM role (for Lambda execution)
+            _aws_session = botocore.session.get_session()
+            if CLOUD_ACCESS_KEY and CLOUD_SECRET_KEY:
+                _aws_session.set_credentials(CLOUD_ACCESS_KEY, CLOUD_SECRET_KEY)
+        if service not in _aws_clients:
+            _aws_clients[service] = _aws_session.create_client(
+                service, region_name=CLOUD_REGION, config=_aws_config
+            )
+    return _aws_clients[service]
+
+def openai_client():
+    """Return the shared async OpenAI client (async so log groups can be analyzed concurrently)"""
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        import httpx
+
+        # HTTP/2 multiplexes concurrent completions over one TLS connection; the pool is
+        # sized to the concurrency cap and idle connections survive between warm invocations
+        _openai_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            # _analyze_batch owns retries so every 429/5xx reaches the backoff and
+            # Backpressure logic instead of being retried silently inside the SDK
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=ANALYSIS_MAX_CONCURRENCY,
+                    max_keepalive_connections=ANALYSIS_MAX_CONCURRENCY,
+                    keepalive_expiry=60.0
+                )
+            )
+        )
+    return _openai_client
+
+def slack_http_client():
+    """Return the shared HTTP/2 client so repeated Slack posts reuse one pooled TLS connection"""
+    global _slack_http
+    if _slack_http is None:
+        import httpx
+        _slack_http = httpx.Client(
+            http2=True,
+            timeout=10.0,
+            # Keep idle connections around between warm invocations instead of re-handshaking
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=8, keepalive_expiry=30.0)
+        )
+    return _slack_http
+
+def put_custom_metric(metric_name, value, unit='Count', dimensions=None):
+    """Queue a custom metric for CloudWatch; buffered metrics are sent by flush_metrics()"""
+    if not METRICS_ENABLED:
+        return
+
+    metric_data = {
+        'MetricName': metric_name,
+        'Value': value,
+        'Unit': unit,
+        # botocore accepts epoch seconds, which avoids building a datetime per metric
+        'Timestamp': time.time()
+    }
+    
+    if dimensions:
+        metric_data['Dimensions'] = dimensions
         
-        if dimensions:
-            metric_data['Dimensions'] = dimensions
-            
-        cloudwatch.put_metric_data(
-            Namespace='LogRemediation',
-            MetricData=[metric_data]
+    _metric_queue.put_nowait(metric_data)
+    if not METRICS_USE_EMF and _metric_worker_thread is None:
+        _start_metric_worker()
+
+def _start_metric_worker():
+    global _metric_worker_thread
+    with _metric_worker_lock:
+        if _metric_worker_thread is None:
+            _metric_worker_thread = threading.Thread(target=_metric_worker, name='metric-worker', daemon=True)
+            _metric_worker_thread.start()
+
+def _metric_worker():
+    """Send queued metrics off the caller's thread, batching up to METRICS_SEND_INTERVAL apart"""
+    while True:
+        batch = []
+        received = 0
+        deadline = None
+        while len(batch) < METRICS_PER_REQUEST:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = _metric_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            received += 1
+            if item is _METRIC_FLUSH:
+                break
+            batch.append(item)
+            deadline = deadline or time.monotonic() + METRICS_SEND_INTERVAL
+
+        if batch:
+            _put_metric_batch(batch)
+        for _ in range(received):
+            _metric_queue.task_done()
+
+def _emit_emf_metrics(metrics):
+    """Print metrics as EMF documents, one per dimension set (max 100 metrics each)"""
+    by_dimensions = {}
+    for metric in metrics:
+        key = tuple((d['Name'], d['Value']) for d in metric.get('Dimensions', []))
+        group = by_dimensions.setdefault(key, {})
+        unit, values = group.setdefault(metric['MetricName'], (metric['Unit'], []))
+        values.append(metric['Value'])
+
+    for dimensions, group in by_dimensions.items():
+        names = list(group)
+        for start in range(0, len(names), EMF_METRICS_PER_DOCUMENT):
+            chunk = names[start:start + EMF_METRICS_PER_DOCUMENT]
+            document = {
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': METRICS_NAMESPACE,
+                        'Dimensions': [[name for name, _ in dimensions]],
+                        'Metrics': [{'Name': name, 'Unit': group[name][0]} for name in chunk]
+                    }]
+                },
+                **dict(dimensions)
+            }
+            for name in chunk:
+                values = group[name][1]
+                document[name] = values[0] if len(values) == 1 else values
+            print(orjson.dumps(document).decode(), flush=True)
+
+def _put_metric_batch(batch):
+    """Send one batch of metrics to CloudWatch with a single PutMetricData call"""
+    try:
+        aws_client('cloudwatch').put_metric_data(
+            Namespace=METRICS_NAMESPACE,
+            MetricData=batch
         )
-        logger.debug(f"✅ Sent metric: {metric_name}={value}")
+        logger.debug("✅ Sent %d metrics", len(batch))
         
     except Exception as e:
         # Check if it's a permissions issue and handle gracefully
         if "AccessDenied" in str(e) and "cloudwatch:PutMetricData" in str(e):
-            logger.debug(f"⚠️  CloudWatch metrics disabled (no permissions): {metric_name}={value}")
+            logger.debug("⚠️  CloudWatch metrics disabled (no permissions): dropped %d metrics", len(batch))
         elif "Unable to locate credentials" in str(e):
-            logger.debug(f"⚠️  CloudWatch metrics disabled (credentials issue): {metric_name}={value}")
+            logger.debug("⚠️  CloudWatch metrics disabled (credentials issue): dropped %d metrics", len(batch))
+        else:
+            logger.error("❌ Failed to put %d metrics: %s", len(batch), e)
+
+def flush_metrics():
+    """Block until every queued metric has been sent to CloudWatch (or emitted via EMF)"""
+    if METRICS_USE_EMF:
+        metrics = []
+        while True:
+            try:
+                metrics.append(_metric_queue.get_nowait())
+            except queue.Empty:
+                break
+            _metric_queue.task_done()
+        if metrics:
+            _emit_emf_metrics(metrics)
+            logger.debug("✅ Emitted %d metrics via EMF", len(metrics))
+        return
+
+    if _metric_worker_thread is None:
+        return
+    # Lambda may freeze the container as soon as the handler returns, so wait for delivery
+    _metric_queue.put(_METRIC_FLUSH)
+    _metric_queue.join()
+
+# Don't lose metrics still queued when a local/container run exits without flushing
+atexit.register(flush_metrics)
+
+class Backpressure:
+    """AIMD controller that sizes OpenAI concurrency from recent call latency
+
+    Latency is recorded per log group, so target_latency does not depend on how
+    many groups a batched request carries.
+    """
+
+    def __init__(self, initial=ANALYSIS_CONCURRENCY, minimum=1, maximum=ANALYSIS_MAX_CONCURRENCY,
+                 alpha=0.5, beta=0.5, target_latency=2.0, window=20):
+        self.c = float(min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.latencies = deque(maxlen=window)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self):
+        return max(self.minimum, int(self.c))
+
+    def record(self, duration, is_error=False):
+        """Additive increase while healthy, multiplicative decrease on errors or slow calls"""
+        self.latencies.append(duration)
+        avg_latency = sum(self.latencies) / len(self.latencies)
+
+        if is_error or avg_latency > self.target_latency:
+            self.c = max(self.minimum, self.c * self.beta)
         else:
-            logger.error(f"❌ Failed to put metric {metric_name}: {e}")
+            self.c = min(self.maximum, self.c + self.alpha)
+
+    async def __aenter__(self):
+        async with self._condition:
+            # Re-checked on every wake-up, so a shrinking limit takes effect immediately
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+# Shared across warm invocations so the learned concurrency carries over
+_backpressure = Backpressure()
+
+# Durations like "1s", "6m0s" or "250ms" as used by OpenAI's x-ratelimit-reset-* headers
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+def _parse_reset_duration(value):
+    """Convert a rate-limit reset header value into seconds (None if unparseable)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    parts = _DURATION_PART_RE.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
 
-def analyze_log_group(name: str) -> dict:
-    """Get AI analysis of a log group with enhanced error handling and metrics"""
+def _retry_after_seconds(error):
+    """Read how long the provider asked us to wait from a rate-limit error's response headers"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        seconds = _parse_reset_duration(retry_after_ms)
+        if seconds is not None:
+            return seconds / 1000
+
+    for header in ('retry-after', 'x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens'):
+        seconds = _parse_reset_duration(headers.get(header))
+        if seconds is not None:
+            return seconds
+    return None
+
+# Fallback for quota errors that don't carry the structured "insufficient_quota" code
+_QUOTA_RE = re.compile(r"quota|billing|insufficient|exceeded your current", re.I)
+
+def _is_quota_error(error):
+    """Tell an exhausted quota/billing limit (don't retry) apart from ordinary rate limiting"""
+    body = getattr(error, 'body', None)
+    body = body if isinstance(body, dict) else {}
+    codes = [code for code in (getattr(error, 'code', None), body.get('code'), body.get('type')) if code]
+    if codes:
+        # Ordinary 429 messages also mention billing, so trust a structured code when there is one
+        return 'insufficient_quota' in codes
+    return bool(_QUOTA_RE.search(str(error)))
+
+def _new_event_loop():
+    """Create a uvloop event loop when it is installed, otherwise the default asyncio loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+def _run_async(coro):
+    """Run a coroutine on the module's persistent event loop"""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = _new_event_loop()
+    return _event_loop.run_until_complete(coro)
+
+def _close_event_loop():
+    """Close the OpenAI client and the persistent loop; only for one-shot (local) runs"""
+    global _event_loop, _openai_client
+    if _event_loop is None or _event_loop.is_closed():
+        return
+    if _openai_client is not None:
+        _event_loop.run_until_complete(_openai_client.close())
+        _openai_client = None
+    _event_loop.run_until_complete(_event_loop.shutdown_asyncgens())
+    _event_loop.close()
+    _event_loop = None
+
+def _analysis_cache_key(name):
+    return hashlib.sha256(f"{name}|{OPENAI_MODEL}|{PROMPT_VERSION}".encode()).hexdigest()
+
+def _remote_cache_get(key):
+    """Fetch an unexpired analysis from DynamoDB or S3, whichever is configured"""
+    if ANALYSIS_CACHE_TABLE:
+        item = aws_client('dynamodb').get_item(
+            TableName=ANALYSIS_CACHE_TABLE,
+            Key={'h': {'S': key}}
+        ).get('Item')
+        if not item:
+            return None
+        entry = {'analysis': item['analysis']['S'], 'expires_at': int(item.get('expires_at', {}).get('N', 0))}
+    else:
+        try:
+            obj = aws_client('s3').get_object(Bucket=ANALYSIS_CACHE_BUCKET, Key=f"analyses/{key}.json")
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            raise
+        entry = orjson.loads(obj['Body'].read())
+
+    # Neither store removes expired entries promptly, so check the TTL ourselves
+    if entry.get('expires_at', 0) < time.time():
+        return None
+    return entry['analysis']
+
+def _remote_cache_put(key, name, analysis):
+    expires_at = int(time.time()) + ANALYSIS_CACHE_TTL
+    if ANALYSIS_CACHE_TABLE:
+        aws_client('dynamodb').put_item(
+            TableName=ANALYSIS_CACHE_TABLE,
+            Item={
+                'h': {'S': key},
+                'log_group': {'S': name},
+                'analysis': {'S': analysis},
+                'expires_at': {'N': str(expires_at)}
+            }
+        )
+    else:
+        aws_client('s3').put_object(
+            Bucket=ANALYSIS_CACHE_BUCKET,
+            Key=f"analyses/{key}.json",
+            Body=orjson.dumps({'log_group': name, 'analysis': analysis, 'expires_at': expires_at}),
+            ContentType='application/json'
+        )
+
+def get_cached_analysis(name):
+    """Look up a previous analysis in memory, then in DynamoDB or S3 (if configured)"""
+    key = _analysis_cache_key(name)
+    with _analysis_cache_lock:
+        if key in _analysis_cache:
+            _analysis_cache.move_to_end(key)
+            return _analysis_cache[key]
+
+    if not ANALYSIS_CACHE_REMOTE:
+        return None
+
+    try:
+        analysis = _remote_cache_get(key)
+    except Exception as e:
+        logger.warning("Analysis cache lookup failed for %s: %s", name, e)
+        return None
+
+    if analysis is not None:
+        _remember_analysis(key, analysis)
+    return analysis
+
+def _remember_analysis(key, analysis):
+    with _analysis_cache_lock:
+        _analysis_cache[key] = analysis
+        _analysis_cache.move_to_end(key)
+        if len(_analysis_cache) > ANALYSIS_CACHE_MAXSIZE:
+            _analysis_cache.popitem(last=False)
+
+def cache_analysis(name, analysis):
+    """Store a successful analysis in memory and in DynamoDB or S3 (if configured)"""
+    key = _analysis_cache_key(name)
+    _remember_analysis(key, analysis)
+
+    if not ANALYSIS_CACHE_REMOTE:
+        return
+
+    try:
+        _remote_cache_put(key, name, analysis)
+    except Exception as e:
+        logger.warning("Failed to cache analysis for %s: %s", name, e)
+
+# Well-known AWS log group naming schemes: prefix -> (service, contents, what to watch, retention)
+_PREFIX_TO_LABEL = {
+    "/aws/lambda/": ("AWS Lambda", "function invocation logs (START/END/REPORT lines plus application output)",
+                     "errors, timeouts, throttles and rising durations", "14-30 days"),
+    "/aws/apigateway/": ("Amazon API Gateway", "API access logs",
+                         "4xx/5xx spikes and latency outliers", "30-90 days"),
+    "API-Gateway-Execution-Logs_": ("Amazon API Gateway", "stage execution logs for request processing",
+                                    "integration failures and authorizer errors", "14-30 days"),
+    "/aws/rds/": ("Amazon RDS", "database engine logs (error, slow query, audit)",
+                  "slow queries, connection errors and failovers", "30-90 days"),
+    "RDSOSMetrics": ("Amazon RDS Enhanced Monitoring", "OS-level metrics for database instances",
+                     "CPU, memory and I/O saturation", "7-30 days"),
+    "/aws/ecs/": ("Amazon ECS", "container and task logs",
+                  "task restarts, OOM kills and application errors", "14-30 days"),
+    "/aws/eks/": ("Amazon EKS", "Kubernetes control plane logs (API server, audit, scheduler)",
+                  "authentication failures and API server errors", "30-90 days"),
+    "/aws/codebuild/": ("AWS CodeBuild", "build output logs",
+                        "failing builds and long build times", "7-30 days"),
+    "/aws/events/": ("Amazon EventBridge", "event bus and rule target logs",
+                     "failed invocations and unexpected event volume", "14-30 days"),
+    "/aws/vendedlogs/states/": ("AWS Step Functions", "state machine execution history",
+                                "failed and timed-out executions", "30-90 days"),
+    "/aws/kinesisfirehose/": ("Amazon Data Firehose", "delivery stream error logs",
+                              "delivery failures and transformation errors", "14-30 days"),
+    "/aws-glue/": ("AWS Glue", "ETL job driver and executor logs",
+                   "job failures and long-running jobs", "30 days"),
+    "/aws/batch/job": ("AWS Batch", "job container output",
+                       "failed jobs and retries", "14-30 days"),
+    "/aws/sagemaker/": ("Amazon SageMaker", "training job, processing job and endpoint logs",
+                        "failed jobs and endpoint invocation errors", "30 days"),
+    "/aws/elasticbeanstalk/": ("AWS Elastic Beanstalk", "platform and application instance logs",
+                               "deployment failures and application errors", "14-30 days"),
+    "/aws/appsync/apis/": ("AWS AppSync", "GraphQL request and resolver logs",
+                           "resolver errors and slow requests", "14-30 days"),
+    "/aws/route53/": ("Amazon Route 53", "DNS query logs",
+                      "NXDOMAIN spikes and unexpected query sources", "30-90 days"),
+    "/aws/OpenSearchService/": ("Amazon OpenSearch Service", "cluster application, slow and audit logs",
+                                "slow searches, indexing errors and cluster health changes", "14-30 days"),
+    "/aws/transfer/": ("AWS Transfer Family", "file transfer session logs",
+                       "failed logins and transfer errors", "30-90 days"),
+    "aws-cloudtrail-logs-": ("AWS CloudTrail", "API activity audit events",
+                             "unauthorized calls and unexpected IAM changes", "90-365 days"),
+    "aws-waf-logs-": ("AWS WAF", "web ACL request logs",
+                      "blocked request spikes and rule false positives", "30-90 days"),
+}
+
+# Render each canned analysis once, and match all prefixes with a single anchored
+# regex scan (longest first) instead of a Python loop of startswith() calls
+_PREFIX_ANALYSES = {
+    prefix: (
+        f"This log group belongs to {service} and contains {contents}. "
+        f"Monitor it for {watch}; a retention period of {retention} is usually sufficient."
+    )
+    for prefix, (service, contents, watch, retention) in _PREFIX_TO_LABEL.items()
+}
+_PREFIX_RE = re.compile("|".join(map(re.escape, sorted(_PREFIX_TO_LABEL, key=len, reverse=True))))
+
+def classify_log_group(name):
+    """Describe a log group from its well-known name prefix, or return None if unknown"""
+    match = _PREFIX_RE.match(name)
+    return _PREFIX_ANALYSES[match.group(0)] if match else None
+
+def _resolve_locally(name):
+    """Answer well-known and previously analyzed log groups without calling OpenAI"""
     start_time = time.time()
-    
-    prompt = f"""Analyze this AWS CloudWatch log group: {name}
 
-Please provide a brief analysis covering:
-1. What type of AWS service this likely belongs to
-2. What kind of logs it probably contains  
-3. Any potential issues or patterns to monitor
-4. Recommended retention period
+    known = classify_log_group(name)
+    if known is not None:
+        put_custom_metric('Analysis_Pattern_Match', 1)
+        logger.info("Matched known log group pattern: %s", name)
+        return {
+            'success': True,
+            'analysis': known,
+            'duration': time.time() - start_time,
+            'attempts': 0,
+            'pattern_match': True
+        }
+
+    cached = get_cached_analysis(name)
+    if cached is not None:
+        put_custom_metric('Analysis_Cache_Hit', 1)
+        logger.info("Using cached analysis for log group: %s", name)
+        return {
+            'success': True,
+            'analysis': cached,
+            'duration': time.time() - start_time,
+            'attempts': 0,
+            'cached': True
+        }
+
+    put_custom_metric('Analysis_Cache_Miss', 1)
+    return None
+
+async def _resolve_all_locally(names):
+    """Resolve many names at once; remote cache lookups run concurrently off the event loop"""
+    if ANALYSIS_CACHE_REMOTE:
+        return await asyncio.gather(*(asyncio.to_thread(_resolve_locally, name) for name in names))
+    return [_resolve_locally(name) for name in names]
+
+async def _cache_analyses(analyses):
+    """Cache many analyses at once; remote cache writes run concurrently off the event loop"""
+    if ANALYSIS_CACHE_REMOTE:
+        await asyncio.gather(*(asyncio.to_thread(cache_analysis, name, analysis)
+                               for name, analysis in analyses.items()))
+    else:
+        for name, analysis in analyses.items():
+            cache_analysis(name, analysis)
+
+def _analysis_text(value):
+    """Normalize one entry of the model's JSON response to plain text"""
+    if isinstance(value, dict):
+        return " ".join(str(part).strip() for part in value.values())
+    return str(value).strip()
+
+# Request parameters that are the same for every batch, built once at import
+_ANALYSIS_REQUEST_DEFAULTS = {
+    "model": OPENAI_MODEL,
+    "temperature": 0,  # Deterministic output keeps cached analyses valid
+    "response_format": {"type": "json_object"}
+}
 
-Keep it concise (2-3 sentences)."""
+def _analysis_request_body(names):
+    """Chat completion parameters for analyzing a batch of log groups"""
+    return {
+        **_ANALYSIS_REQUEST_DEFAULTS,
+        "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": "\n".join(names)}],
+        "max_tokens": sum(ANALYSIS_TOKENS_PER_GROUP + len(name) // 2 for name in names),
+    }
+
+async def _analyze_batch(names, backpressure=None) -> dict:
+    """Get AI analysis of several log groups in one request with enhanced error handling and metrics"""
+    from openai import RateLimitError
+
+    start_time = time.time()
+    request_body = _analysis_request_body(names)
     
     max_retries = 4
     base_delay = 1
 
     for attempt in range(max_retries):
+        attempt_start = time.time()
         try:
-            logger.info(f"Calling OpenAI API for log group: {name} (attempt {attempt + 1})")
+            logger.info("Calling OpenAI API for %d log groups (attempt %d)", len(names), attempt + 1)
             
-            resp = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.3
-            )
+            stream = await openai_client().chat.completions.create(**request_body, stream=True)
+            
+            # Collect tokens as they arrive instead of waiting for the full completion
+            parts = []
+            finish_reason = None
+            async for chunk in stream:
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    parts.append(choice.delta.content or "")
+                    finish_reason = choice.finish_reason or finish_reason
+
+            if finish_reason == 'length':
+                # A cut-off JSON object can't be parsed, so retry with a bigger budget
+                # instead of failing every group in the batch
+                put_custom_metric('OpenAI_API_Truncated', 1)
+                if backpressure:
+                    backpressure.record((time.time() - attempt_start) / len(names))
+                if attempt < max_retries - 1:
+                    request_body = {**request_body, "max_tokens": request_body["max_tokens"] * 2}
+                    logger.warning("Response truncated at %d tokens (attempt %d/%d), retrying with a larger budget",
+                                   request_body["max_tokens"] // 2, attempt + 1, max_retries)
+                    continue
+                logger.error("Response still truncated after %d attempts", max_retries)
+                return {
+                    'success': False,
+                    'error': 'truncated_response',
+                    'attempts': attempt + 1
+                }
             
-            result = resp.choices[0].message.content.strip()
+            analyses = orjson.loads("".join(parts))
             duration = time.time() - start_time
+            if backpressure:
+                backpressure.record((time.time() - attempt_start) / len(names))
             
             # Send success metrics
             put_custom_metric('OpenAI_API_Success', 1)
             put_custom_metric('OpenAI_API_Duration', duration * 1000, 'Milliseconds')
             put_custom_metric('OpenAI_API_Attempts', attempt + 1)
             
-            logger.info(f"Successfully got analysis from OpenAI in {duration:.2f}s")
+            logger.info("Successfully got %d analyses from OpenAI in %.2fs", len(analyses), duration)
             return {
                 'success': True,
-                'analysis': result,
+                'analyses': {name: _analysis_text(value) for name, value in analyses.items()},
                 'duration': duration,
                 'attempts': attempt + 1
             }
 
         except RateLimitError as e:
-            error_msg = str(e).lower()
             put_custom_metric('OpenAI_API_RateLimit', 1)
+            if backpressure:
+                backpressure.record((time.time() - attempt_start) / len(names), is_error=True)
             
             # Check for quota/billing issues
-            if any(keyword in error_msg for keyword in ['quota', 'billing', 'insufficient', 'exceeded your current']):
-                alert = f"🚨 *OpenAI API Quota Issue* 🚨\n\nStopped processing log group: `{name}`\nError: {str(e)}"
+            if _is_quota_error(e):
+                stopped = ", ".join(f"`{name}`" for name in names)
+                alert = f"🚨 *OpenAI API Quota Issue* 🚨\n\nStopped processing log groups: {stopped}\nError: {str(e)}"
                 post_to_slack(alert)
                 put_custom_metric('OpenAI_API_QuotaExceeded', 1)
-                logger.error(f"OpenAI quota exceeded: {e}")
+                logger.error("OpenAI quota exceeded: %s", e)
                 return {
                     'success': False,
                     'error': 'quota_exceeded',
@@ -142,10 +762,30 @@ Keep it concise (2-3 sentences)."""
                 }
 
             # Regular rate limiting - exponential backoff
+            retry_after = _retry_after_seconds(e)
+            if retry_after is not None and retry_after > MAX_BACKOFF:
+                # Retrying sooner than asked would only burn attempts, and waiting that long
+                # would outlive the run, so give up on this batch now
+                put_custom_metric('OpenAI_API_Failed', 1)
+                logger.error("Rate limited and asked to wait %.2fs (over the %.0fs cap), giving up", retry_after, MAX_BACKOFF)
+                return {
+                    'success': False,
+                    'error': 'rate_limited',
+                    'attempts': attempt + 1
+                }
+
             if attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                logger.warning(f"Rate limited (attempt {attempt + 1}/{max_retries}), retrying in {delay}s...")
-                time.sleep(delay)
+                backoff = base_delay * (2 ** attempt)
+                if retry_after is not None:
+                    # Never retry sooner than the provider asked; jitter on top of it spreads
+                    # out workers that were all told the same Retry-After
+                    delay = retry_after + random.uniform(0, min(backoff, MAX_BACKOFF - retry_after))
+                    logger.warning("Rate limited (attempt %d/%d), retrying in %.2fs (API asked for %.2fs)...", attempt + 1, max_retries, delay, retry_after)
+                else:
+                    # Full jitter keeps concurrent workers from retrying in lockstep
+                    delay = random.uniform(0, min(MAX_BACKOFF, backoff))
+                    logger.warning("Rate limited (attempt %d/%d), retrying in %.2fs (jittered backoff)...", attempt + 1, max_retries, delay)
+                await asyncio.sleep(delay)
             else:
                 put_custom_metric('OpenAI_API_Failed', 1)
                 logger.error("Max retries exceeded for rate limiting")
@@ -157,7 +797,11 @@ Keep it concise (2-3 sentences)."""
 
         except Exception as e:
             put_custom_metric('OpenAI_API_Error', 1)
-            logger.error(f"Unexpected error analyzing log group {name}: {e}")
+            if backpressure:
+                # Server-side errors (5xx) are a sign of overload, like rate limiting
+                is_server_error = (getattr(e, 'status_code', None) or 0) >= 500
+                backpressure.record((time.time() - attempt_start) / len(names), is_error=is_server_error)
+            logger.error("Unexpected error analyzing log groups %s: %s", ", ".join(names), e)
             return {
                 'success': False,
                 'error': str(e)[:100],
@@ -171,65 +815,277 @@ Keep it concise (2-3 sentences)."""
     }
 
 def post_to_slack(text: str):
+    """Queue a message for Slack; buffered messages are sent together by flush_slack()"""
+    _slack_buffer.append(text)
+
+def _slack_blocks(messages, limit=SLACK_MAX_SECTION_CHARS):
+    """Turn buffered messages into mrkdwn section blocks, splitting any that exceed a section"""
+    blocks = []
+    for message in messages:
+        for i in range(0, len(message), limit):
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": message[i:i + limit]}})
+    return blocks
+
+def flush_slack():
+    """Send all buffered Slack messages as a single Block Kit digest (split if very long)"""
+    if not _slack_buffer:
+        return True
+
+    if not SLACK_WEBHOOK_URL:
+        # Don't let a missing webhook raise from flush_all() and mask the run's real outcome
+        logger.warning("SLACK_WEBHOOK_URL is not set; dropping %d Slack messages", len(_slack_buffer))
+        _slack_buffer.clear()
+        put_custom_metric('Slack_Message_Failed', 1)
+        return False
+
+    blocks = _slack_blocks(_slack_buffer)
+    _slack_buffer.clear()
+
+    success = True
+    for i in range(0, len(blocks), SLACK_MAX_BLOCKS):
+        digest = blocks[i:i + SLACK_MAX_BLOCKS]
+        # Plain-text fallback for notifications and clients that can't render blocks
+        text = SLACK_MESSAGE_SEPARATOR.join(block["text"]["text"] for block in digest)
+        success = _send_to_slack(text[:SLACK_MAX_MESSAGE_CHARS], digest) and success
+    return success
+
+def _send_to_slack(text: str, blocks=None):
     """Post message to Slack via webhook with metrics and retries"""
+    import httpx
+
     max_retries = 3
+    payload = {"text": text}
+    if blocks:
+        payload["blocks"] = blocks
     
     for attempt in range(max_retries):
         try:
-            response = requests.post(
+            response = slack_http_client().post(
                 SLACK_WEBHOOK_URL, 
-                json={"text": text}, 
-                timeout=10
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"}
             )
             response.raise_for_status()
             put_custom_metric('Slack_Message_Success', 1)
             logger.info("Successfully posted to Slack")
             return True
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             if attempt < max_retries - 1:
-                logger.warning(f"Slack post failed (attempt {attempt + 1}), retrying: {e}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                logger.warning("Slack post failed (attempt %d), retrying: %s", attempt + 1, e)
+                time.sleep(random.uniform(0, min(MAX_BACKOFF, 2 ** attempt)))  # Exponential backoff with full jitter
             else:
                 put_custom_metric('Slack_Message_Failed', 1)
-                logger.error(f"Failed to post to Slack after {max_retries} attempts: {e}")
+                logger.error("Failed to post to Slack after %d attempts: %s", max_retries, e)
                 return False
 
-def fetch_log_groups():
-    """Fetch CloudWatch log groups from AWS with error handling and metrics"""
+def _slack_api(method, payload):
+    """Call a Slack Web API method with the bot token; returns the response body or None"""
+    import httpx
+
     try:
-        # Use IAM role if running in Lambda, otherwise use provided credentials
-        if CLOUD_ACCESS_KEY and CLOUD_SECRET_KEY:
-            aws_client = boto3.client(
-                "logs",
-                region_name=CLOUD_REGION,
-                aws_access_key_id=CLOUD_ACCESS_KEY,
-                aws_secret_access_key=CLOUD_SECRET_KEY,
-            )
+        response = slack_http_client().post(
+            f"https://slack.com/api/{method}",
+            content=orjson.dumps(payload),
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "Authorization": f"Bearer {SLACK_BOT_TOKEN}"
+            }
+        )
+        response.raise_for_status()
+        body = orjson.loads(response.content)
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        logger.warning("Slack %s failed: %s", method, e)
+        return None
+
+    if not body.get('ok'):
+        logger.warning("Slack %s failed: %s", method, body.get('error'))
+        return None
+    return body
+
+class SlackProgress:
+    """Live Slack status message: posted once, then edited at most every SLACK_PROGRESS_INTERVAL"""
+
+    def __init__(self, interval=SLACK_PROGRESS_INTERVAL):
+        self.enabled = bool(SLACK_BOT_TOKEN and SLACK_CHANNEL)
+        self.interval = interval
+        self._channel = None
+        self._ts = None
+        self._text = None
+        self._sent_text = None
+        self._last_sent = 0.0
+        self._task = None
+        self._sending = False
+        self._finished = False
+
+    async def start(self, text):
+        if not self.enabled:
+            return
+        body = await asyncio.to_thread(_slack_api, 'chat.postMessage', {'channel': SLACK_CHANNEL, 'text': text})
+        if body:
+            # chat.update needs the channel ID, which may differ from the configured name
+            self._channel, self._ts = body['channel'], body['ts']
+            self._text = self._sent_text = text
+            self._last_sent = time.monotonic()
+
+    def update(self, text):
+        """Schedule an edit; edits arriving faster than the interval are coalesced"""
+        if self._ts is None:
+            return
+        self._text = text
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._send_latest())
+
+    async def _send_latest(self):
+        while not self._finished and self._text != self._sent_text:
+            await asyncio.sleep(max(0.0, self._last_sent + self.interval - time.monotonic()))
+            text = self._text
+            self._last_sent = time.monotonic()
+            self._sending = True
+            try:
+                await asyncio.to_thread(_slack_api, 'chat.update', {'channel': self._channel, 'ts': self._ts, 'text': text})
+            finally:
+                self._sending = False
+            self._sent_text = text
+
+    async def finish(self, text):
+        """Send the final text right away, superseding any throttled edit still pending"""
+        if self._ts is None:
+            return
+        self._finished = True
+        if self._task is not None and not self._task.done():
+            # Cancelling can't stop a request already handed to a worker thread, so only
+            # cancel while throttled; otherwise let it land before the final edit goes out
+            if not self._sending:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._text = text
+        await asyncio.to_thread(_slack_api, 'chat.update', {'channel': self._channel, 'ts': self._ts, 'text': text})
+        self._sent_text = text
+
+async def analyze_log_groups(names, backpressure=None, on_progress=None):
+    """Analyze several log groups, batching the OpenAI calls and running batches concurrently
+
+    on_progress, if given, is called as on_progress(done, total) each time a batch finishes.
+    """
+    backpressure = backpressure or _backpressure
+    results = {}
+    pending = []
+    unique_names = list(dict.fromkeys(names))
+    for name, local in zip(unique_names, await _resolve_all_locally(unique_names)):
+        if local is not None:
+            results[name] = local
         else:
-            # Use IAM role (for Lambda execution)
-            aws_client = boto3.client("logs", region_name=CLOUD_REGION)
-            
-        resp = aws_client.describe_log_groups(limit=50)  # Limit to avoid too many results
-        log_groups = resp.get("logGroups", [])
+            pending.append(name)
+
+    batches = [pending[i:i + ANALYSIS_BATCH_SIZE] for i in range(0, len(pending), ANALYSIS_BATCH_SIZE)]
+
+    done = len(results)
+
+    async def bounded(batch):
+        nonlocal done
+        try:
+            async with backpressure:
+                return await _analyze_batch(batch, backpressure)
+        finally:
+            done += len(batch)
+            if on_progress:
+                on_progress(done, len(unique_names))
+
+    batch_results = await asyncio.gather(*(bounded(batch) for batch in batches), return_exceptions=True)
+
+    new_analyses = {}
+    for batch, batch_result in zip(batches, batch_results):
+        # Turn unexpected exceptions into regular failure results
+        if isinstance(batch_result, BaseException):
+            batch_result = {'success': False, 'error': str(batch_result)[:100], 'attempts': 0}
+
+        for name in batch:
+            if not batch_result['success']:
+                results[name] = batch_result
+                continue
+
+            analysis = batch_result['analyses'].get(name)
+            if not analysis:
+                results[name] = {
+                    'success': False,
+                    'error': 'missing_from_response',
+                    'attempts': batch_result['attempts']
+                }
+                continue
+
+            new_analyses[name] = analysis
+            results[name] = {
+                'success': True,
+                'analysis': analysis,
+                'duration': batch_result['duration'],
+                'attempts': batch_result['attempts']
+            }
+
+    await _cache_analyses(new_analyses)
+    return [results[name] for name in names]
+
+# describe_log_groups returns at most 50 groups per page
+LOG_GROUPS_MAX_PAGE_SIZE = 50
+
+def iter_log_groups(prefix: str | None = None, page_size: int = LOG_GROUPS_MAX_PAGE_SIZE):
+    """Yield CloudWatch log groups lazily; the next page is only requested when consumed"""
+    # Let CloudWatch do the filtering rather than paging through every group
+    params = {"logGroupNamePrefix": prefix} if prefix else {}
+
+    paginator = aws_client('logs').get_paginator("describe_log_groups")
+    for page in paginator.paginate(PaginationConfig={"PageSize": page_size}, **params):
+        yield from page.get("logGroups", [])
+
+def fetch_log_groups(prefix: str | None = None, max_items: int | None = None):
+    """Fetch up to max_items CloudWatch log groups (all if None) with error handling and metrics"""
+    try:
+        # Size pages to the request so e.g. 3 groups cost one small API call
+        page_size = min(max_items, LOG_GROUPS_MAX_PAGE_SIZE) if max_items else LOG_GROUPS_MAX_PAGE_SIZE
+        log_groups = list(itertools.islice(iter_log_groups(prefix, page_size), max_items))
         
         put_custom_metric('LogGroups_Found', len(log_groups))
-        logger.info(f"Found {len(log_groups)} log groups")
+        logger.info("Found %d log groups", len(log_groups))
         return log_groups
         
     except Exception as e:
         put_custom_metric('AWS_API_Error', 1)
-        logger.error(f"Failed to fetch log groups: {e}")
+        logger.error("Failed to fetch log groups: %s", e)
         return []
 
-def process_log_groups(limit=3):
+# Labels for the retention periods CloudWatch offers most often
+_RETENTION_LABELS = {
+    1: "1 day",
+    7: "1 week",
+    30: "1 month",
+    90: "3 months",
+    365: "1 year",
+    731: "2 years",
+}
+
+def _format_retention(days):
+    if not days:
+        return "Never expires"
+    return _RETENTION_LABELS.get(days) or f"{days} days"
+
+@functools.lru_cache(maxsize=256)
+def _format_creation_time(ms):
+    """Render a CloudWatch creationTime (epoch milliseconds) as a UTC timestamp"""
+    return time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(ms / 1000))
+
+async def process_log_groups(limit=3, prefix=LOG_GROUP_PREFIX):
     """Process multiple log groups with comprehensive monitoring and error handling"""
     start_time = time.time()
+    progress = SlackProgress()
     
     try:
         put_custom_metric('Processing_Started', 1)
         
-        groups = fetch_log_groups()
+        # botocore is blocking, so keep the event loop free while the log groups are listed
+        groups = await asyncio.to_thread(fetch_log_groups, prefix=prefix, max_items=limit)
         if not groups:
             message = "🔍 No CloudWatch log groups found in the region."
             logger.info(message)
@@ -237,34 +1093,48 @@ def process_log_groups(limit=3):
             put_custom_metric('Processing_Completed', 0)
             return
 
-        total_groups = len(groups)
-        processing_count = min(limit, total_groups)
+        processing_count = len(groups)
         
-        logger.info(f"Found {total_groups} log groups, processing first {processing_count}")
+        logger.info("Processing %d log groups", processing_count)
         put_custom_metric('LogGroups_ToProcess', processing_count)
         
         successful_analyses = 0
         failed_analyses = 0
+        cached_analyses = 0
+        # Only groups that actually went to OpenAI count towards API time
+        api_analyses = 0
         total_api_time = 0
         
-        # Process up to 'limit' groups
-        for i, group in enumerate(groups[:limit]):
+        # Analyze the fetched groups concurrently, keeping the live progress message current
+        await progress.start(f"⏳ Analyzing {processing_count} log groups...")
+        results = await analyze_log_groups(
+            [group["logGroupName"] for group in groups],
+            on_progress=lambda done, total: progress.update(f"⏳ Analyzed {done}/{total} log groups...")
+        )
+        
+        for i, (group, result) in enumerate(zip(groups, results)):
             log_group_name = group["logGroupName"]
             creation_time = group.get("creationTime", "Unknown")
-            retention_days = group.get("retentionInDays", "Never expires")
+            retention = _format_retention(group.get("retentionInDays"))
             
-            logger.info(f"Processing log group {i+1}/{processing_count}: {log_group_name}")
-            
-            # Analyze log group
-            result = analyze_log_group(log_group_name)
+            logger.info("Processing log group %d/%d: %s", i + 1, processing_count, log_group_name)
             
             if result['success']:
                 successful_analyses += 1
-                total_api_time += result['duration']
+                if result['attempts'] > 0:
+                    api_analyses += 1
+                    total_api_time += result['duration']
+                if result.get('pattern_match'):
+                    analysis_time = "instant (known log group pattern)"
+                elif result.get('cached'):
+                    cached_analyses += 1
+                    analysis_time = "cached"
+                else:
+                    analysis_time = f"{result['duration']:.2f}s (attempts: {result['attempts']})"
                 
                 # Format creation time
                 if isinstance(creation_time, int):
-                    formatted_time = time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(creation_time/1000))
+                    formatted_time = _format_creation_time(creation_time)
                 else:
                     formatted_time = str(creation_time)
                 
@@ -273,8 +1143,8 @@ def process_log_groups(limit=3):
 
 *Log Group:* `{log_group_name}`
 *Created:* {formatted_time}
-*Retention:* {retention_days} days
-*Analysis Time:* {result['duration']:.2f}s (attempts: {result['attempts']})
+*Retention:* {retention}
+*Analysis Time:* {analysis_time}
 
 *🤖 AI Analysis:*
 {result['analysis']}
@@ -282,23 +1152,19 @@ def process_log_groups(limit=3):
 ---"""
                 
                 post_to_slack(slack_msg)
-                logger.info(f"Successfully processed: {log_group_name}")
+                logger.info("Successfully processed: %s", log_group_name)
                 
             else:
                 failed_analyses += 1
                 error_msg = f"❌ Failed to process log group `{log_group_name}`: {result.get('error', 'Unknown error')}"
                 logger.error(error_msg)
                 post_to_slack(error_msg)
-            
-            # Small delay between processing to be respectful to APIs
-            if i < processing_count - 1:  # Don't sleep after the last item
-                time.sleep(2)
         
         # Send comprehensive metrics
         put_custom_metric('LogGroups_Processed_Success', successful_analyses)
         put_custom_metric('LogGroups_Processed_Failed', failed_analyses)
-        put_custom_metric('Average_API_Time', 
-                         total_api_time / max(successful_analyses, 1), 'Seconds')
+        if api_analyses:
+            put_custom_metric('Average_API_Time', total_api_time / api_analyses, 'Seconds')
         
         # Summary message
         total_duration = time.time() - start_time
@@ -310,64 +1176,316 @@ def process_log_groups(limit=3):
 • Analyzed: {successful_analyses}/{processing_count} log groups
 • Success Rate: {success_rate:.1f}%
 • Failed: {failed_analyses}
+• Served from Cache: {cached_analyses}
 • Total Duration: {total_duration:.2f}s
-• Avg Analysis Time: {total_api_time/max(successful_analyses, 1):.2f}s
-• Total Available: {total_groups} log groups
+• Avg OpenAI Analysis Time: {total_api_time/max(api_analyses, 1):.2f}s ({api_analyses} log groups)
 
 🔍 *Next Steps:* Check CloudWatch metrics in the LogRemediation namespace for detailed monitoring."""
 
         post_to_slack(summary)
+        await progress.finish(f"✅ Analyzed {successful_analyses}/{processing_count} log groups ({failed_analyses} failed)")
         put_custom_metric('Processing_Duration', total_duration, 'Seconds')
         put_custom_metric('Processing_Success_Rate', success_rate, 'Percent')
         put_custom_metric('Processing_Completed', 1)
         
-        logger.info(f"Log group processing completed successfully: {successful_analyses}/{processing_count} processed")
+        logger.info("Log group processing completed successfully: %d/%d processed", successful_analyses, processing_count)
         
     except Exception as e:
         error_msg = f"🚨 *Critical Error* in log processing: {str(e)}"
         logger.error(error_msg)
         post_to_slack(error_msg)
         put_custom_metric('Processing_Critical_Error', 1)
+        await progress.finish(f"🚨 Log group analysis failed: {str(e)}")
         raise  # Re-raise to ensure Lambda reports the error
 
+    finally:
+        flush_all()
+
+# Key of the DynamoDB item whose string set holds the IDs of unfinished batch jobs
+_PENDING_BATCHES_KEY = {'h': {'S': 'openai-batches:pending'}}
+_BATCH_RUNNING_STATUSES = {'validating', 'in_progress', 'finalizing'}
+
+def _remember_pending_batch(batch_id):
+    if not BATCH_STATE_TABLE:
+        logger.warning("BATCH_STATE_TABLE not set; pass batch_id %s to the collector explicitly", batch_id)
+        return
+    aws_client('dynamodb').update_item(
+        TableName=BATCH_STATE_TABLE,
+        Key=_PENDING_BATCHES_KEY,
+        UpdateExpression='ADD batch_ids :id',
+        ExpressionAttributeValues={':id': {'SS': [batch_id]}}
+    )
+
+def _forget_pending_batch(batch_id):
+    if not BATCH_STATE_TABLE:
+        return
+    aws_client('dynamodb').update_item(
+        TableName=BATCH_STATE_TABLE,
+        Key=_PENDING_BATCHES_KEY,
+        UpdateExpression='DELETE batch_ids :id',
+        ExpressionAttributeValues={':id': {'SS': [batch_id]}}
+    )
+
+def _pending_batches():
+    if not BATCH_STATE_TABLE:
+        return []
+    item = aws_client('dynamodb').get_item(
+        TableName=BATCH_STATE_TABLE,
+        Key=_PENDING_BATCHES_KEY
+    ).get('Item', {})
+    return item.get('batch_ids', {}).get('SS', [])
+
+async def submit_analysis_batch(limit=None, prefix=LOG_GROUP_PREFIX):
+    """Queue analyses of all uncached log groups with the OpenAI Batch API (24h turnaround, half the cost)"""
+    groups = await asyncio.to_thread(fetch_log_groups, prefix=prefix, max_items=limit)
+    names = [group["logGroupName"] for group in groups]
+    pending = [name for name, local in zip(names, await _resolve_all_locally(names)) if local is None]
+
+    # Batch API calls have no retry loop of their own, so keep the SDK's retries for them
+    client = openai_client().with_options(max_retries=2)
+
+    # Don't pay twice for names an earlier batch will deliver at the next collection
+    queued = await _queued_batch_names(client)
+    pending = [name for name in pending if name not in queued]
+    if not pending:
+        logger.info("All %d log groups are already analyzed or queued; nothing to submit", len(groups))
+        return None
+
+    # One request per chunk of names, using the same prompt as the synchronous path
+    lines = [
+        orjson.dumps({
+            "custom_id": f"log-groups-{i // ANALYSIS_BATCH_SIZE}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _analysis_request_body(pending[i:i + ANALYSIS_BATCH_SIZE])
+        })
+        for i in range(0, len(pending), ANALYSIS_BATCH_SIZE)
+    ]
+
+    input_file = await client.files.create(
+        file=("log-group-analyses.jsonl", b"\n".join(lines)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    await asyncio.to_thread(_remember_pending_batch, batch.id)
+
+    put_custom_metric('OpenAI_Batch_Submitted', 1)
+    put_custom_metric('OpenAI_Batch_LogGroups', len(pending))
+    logger.info("Submitted OpenAI batch %s for %d log groups", batch.id, len(pending))
+    post_to_slack(f"📦 *Batch Analysis Submitted*\n\nBatch ID: `{batch.id}`\nLog groups queued: {len(pending)}")
+    return batch.id
+
+async def _queued_batch_names(client):
+    """Log group names covered by pending batches that are running or awaiting collection"""
+    queued = set()
+    for batch_id in await asyncio.to_thread(_pending_batches):
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_RUNNING_STATUSES or batch.status == 'completed':
+            request_names = _batch_request_names((await client.files.content(batch.input_file_id)).text)
+            queued.update(itertools.chain.from_iterable(request_names.values()))
+    return queued
+
+def _batch_request_names(input_jsonl):
+    """Map each custom_id in a batch input file back to the log group names it asked about"""
+    names = {}
+    for line in input_jsonl.splitlines():
+        if line.strip():
+            request = orjson.loads(line)
+            names[request["custom_id"]] = request["body"]["messages"][-1]["content"].split("\n")
+    return names
+
+async def collect_analysis_batches(batch_ids=None):
+    """Fetch finished Batch API jobs, cache their analyses and report them on Slack"""
+    # Batch API calls have no retry loop of their own, so keep the SDK's retries for them
+    client = openai_client().with_options(max_retries=2)
+    collected = 0
+
+    for batch_id in batch_ids or await asyncio.to_thread(_pending_batches):
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_RUNNING_STATUSES:
+            logger.info("OpenAI batch %s is still %s", batch_id, batch.status)
+            continue
+
+        if batch.status != 'completed' or not batch.output_file_id:
+            put_custom_metric('OpenAI_Batch_Failed', 1)
+            post_to_slack(f"❌ OpenAI batch `{batch_id}` finished with status `{batch.status}`")
+            await asyncio.to_thread(_forget_pending_batch, batch_id)
+            continue
+
+        request_names = _batch_request_names((await client.files.content(batch.input_file_id)).text)
+        output = (await client.files.content(batch.output_file_id)).text
+
+        analyses = {}
+        failed = 0
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            names = request_names.get(record.get("custom_id"), [])
+            try:
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                parsed = orjson.loads(content)
+                if not isinstance(parsed, dict):
+                    raise TypeError("analysis response is not a JSON object")
+            except (KeyError, IndexError, TypeError, ValueError):
+                failed += len(names)
+                continue
+            for name in names:
+                if parsed.get(name):
+                    analyses[name] = _analysis_text(parsed[name])
+                else:
+                    failed += 1
+
+        # Requests that failed outright are only listed in the error file
+        if batch.error_file_id:
+            errors = (await client.files.content(batch.error_file_id)).text
+            for line in errors.splitlines():
+                if line.strip():
+                    failed += len(request_names.get(orjson.loads(line).get("custom_id"), []))
+
+        await _cache_analyses(analyses)
+
+        sections = [f"*`{name}`*\n{analysis}" for name, analysis in analyses.items()]
+        post_to_slack("\n\n".join([
+            f"📦 *Batch Analysis Results* (`{batch_id}`)",
+            f"Analyzed: {len(analyses)} log groups, failed: {failed}",
+            *sections
+        ]))
+
+        put_custom_metric('OpenAI_Batch_Completed', 1)
+        put_custom_metric('LogGroups_Processed_Success', len(analyses))
+        put_custom_metric('LogGroups_Processed_Failed', failed)
+        await asyncio.to_thread(_forget_pending_batch, batch_id)
+        collected += 1
+
+    return collected
+
+def flush_all():
+    """Deliver everything still buffered for Slack and CloudWatch"""
+    flush_slack()
+    flush_metrics()
+
+def run_remediation(startup_details, limit=3):
+    """Shared entry point: announce the run on Slack, then process log groups"""
+    startup_msg = "\n".join([
+        "🤖 *AI Log Remediation Started* ",
+        *startup_details,
+        "Beginning analysis of CloudWatch log groups..."
+    ])
+    post_to_slack(startup_msg)
+    
+    try:
+        _run_async(process_log_groups(limit=limit))
+    finally:
+        # Deliver anything still buffered (e.g. errors raised before processing finished)
+        flush_all()
+
 def lambda_handler(event, context):
     """Lambda entry point with proper error handling"""
     logger.info("🚀 Starting AI-Driven Log Remediation Tool (Lambda mode)")
+    execution_id = context.aws_request_id if context else 'local'
     
     try:
-        # Send startup notification
-        startup_msg = f"🤖 *AI Log Remediation Started* \nRegion: {CLOUD_REGION}\nExecution ID: {context.aws_request_id if context else 'local'}\nBeginning analysis of CloudWatch log groups..."
-        post_to_slack(startup_msg)
-        
-        # Process log groups
-        process_log_groups(limit=3)
+        run_remediation([f"Region: {CLOUD_REGION}", f"Execution ID: {execution_id}"])
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'message': 'Log remediation completed successfully',
-                'executionId': context.aws_request_id if context else 'local',
+                'executionId': execution_id,
                 'region': CLOUD_REGION
-            })
+            }).decode()
         }
         
     except Exception as e:
-        logger.error(f"Lambda execution failed: {e}")
+        logger.error("Lambda execution failed: %s", e)
         put_custom_metric('Lambda_Execution_Failed', 1)
         
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'error': str(e),
-                'executionId': context.aws_request_id if context else 'local'
-            })
+                'executionId': execution_id
+            }).decode()
         }
 
+    finally:
+        # Also covers metrics recorded by the error path above
+        flush_all()
+
+def batch_submit_handler(event, context):
+    """Lambda entry point for scheduled runs that can wait for the OpenAI Batch API"""
+    logger.info("🚀 Submitting OpenAI batch analysis (Lambda mode)")
+    
+    try:
+        batch_id = _run_async(submit_analysis_batch(limit=(event or {}).get('limit')))
+        return {
+            'statusCode': 200,
+            'body': orjson.dumps({'batchId': batch_id, 'region': CLOUD_REGION}).decode()
+        }
+        
+    except Exception as e:
+        logger.error("Batch submission failed: %s", e)
+        put_custom_metric('Lambda_Execution_Failed', 1)
+        return {
+            'statusCode': 500,
+            'body': orjson.dumps({'error': str(e)}).decode()
+        }
+
+    finally:
+        flush_all()
+
+def batch_collect_handler(event, context):
+    """Lambda entry point (run on a schedule) that collects finished OpenAI batches"""
+    logger.info("🚀 Collecting OpenAI batch results (Lambda mode)")
+    batch_id = (event or {}).get('batch_id')
+    
+    try:
+        collected = _run_async(collect_analysis_batches([batch_id] if batch_id else None))
+        return {
+            'statusCode': 200,
+            'body': orjson.dumps({'batchesCollected': collected}).decode()
+        }
+        
+    except Exception as e:
+        logger.error("Batch collection failed: %s", e)
+        put_custom_metric('Lambda_Execution_Failed', 1)
+        return {
+            'statusCode': 500,
+            'body': orjson.dumps({'error': str(e)}).decode()
+        }
+
+    finally:
+        flush_all()
+
+def _prewarm_aws_clients():
+    """Create the clients every Lambda run needs while the container initializes"""
+    services = ['logs']
+    if METRICS_ENABLED and not METRICS_USE_EMF:
+        services.append('cloudwatch')
+    if ANALYSIS_CACHE_TABLE or BATCH_STATE_TABLE:
+        services.append('dynamodb')
+    # The table takes precedence as the cache backend, so S3 is only used without one
+    if ANALYSIS_CACHE_BUCKET and not ANALYSIS_CACHE_TABLE:
+        services.append('s3')
+    for service in services:
+        aws_client(service)
+
+# Lambda runs module code once per container (and SnapStart snapshots it), so build
+# the clients here rather than during the first invocation; local runs stay lazy
+if RUNNING_IN_LAMBDA:
+    _prewarm_aws_clients()
+
 if __name__ == "__main__":
     # For local testing
     logger.info("🚀 Starting AI-Driven Log Remediation Tool (Local mode)")
     
-    startup_msg = f"🤖 *AI Log Remediation Started* \nMode: Local Development\nRegion: {CLOUD_REGION}\nBeginning analysis of CloudWatch log groups..."
-    post_to_slack(startup_msg)
-    
-    process_log_groups(limit=3)
\ No newline at end of file
+    try:
+        run_remediation(["Mode: Local Development", f"Region: {CLOUD_REGION}"])
+    finally:
+        # Nothing reuses the loop after a local run, so shut it down cleanly
+        _close_event_loop()
\ No newline at end of file